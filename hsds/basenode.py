@@ -26,8 +26,8 @@ from asyncio import CancelledError
 
 
 import config
-from util.httpUtil import http_get, http_post, jsonResponse
-from util.idUtil import createNodeId
+from util.httpUtil import http_get, http_post, jsonResponse, release_http_client
+from util.idUtil import createNodeId, getDataNodeUrls
 from util.authUtil import getUserPasswordFromRequest, validateUserPassword
 import hsds_logger as log
 from kubernetes import client as k8s_client
@@ -376,6 +376,28 @@ async def k8s_register(app):
             app["node_state"] = "SCALING"
 
 
+async def prewarmDataNodeConnections(app):
+    """ Send a cheap request to any DN that hasn't been contacted yet, so that
+    the shared http client has a pooled connection to each DN before client
+    requests need one """
+    prewarmed_urls = app["prewarmed_dn_urls"]
+    dn_urls = [url for url in getDataNodeUrls(app) if url not in prewarmed_urls]
+    if not dn_urls:
+        return
+    log.info(f"prewarming connections to {len(dn_urls)} data nodes")
+
+    async def ping(url):
+        try:
+            await http_get(app, url + "/about")
+        except Exception as e:
+            # includes connection errors and timeouts - try again on the next health check
+            log.debug(f"prewarm request to {url} failed: {e}")
+            return False
+        return True
+
+    results = await asyncio.gather(*[ping(url) for url in dn_urls])
+    prewarmed_urls.update([url for url, ok in zip(dn_urls, results) if ok])
+
 async def healthCheck(app):
     """ Periodic method that either registers with headnode (if state in INITIALIZING) or
     calls headnode to verify vitals about this node (otherwise)"""
@@ -466,12 +488,46 @@ async def healthCheck(app):
             except HTTPGone as hg:
                 log.warn(f"HTTPGone <{hg.code}> for health heck")
 
-        svmem = psutil.virtual_memory()
-        num_tasks = len(asyncio.Task.all_tasks())
-        active_tasks = len([task for task in asyncio.Task.all_tasks() if not task.done()])
-        log.debug(f"health check sleep: {sleep_secs}, vm: {svmem.percent} num tasks: {num_tasks} active tasks: {active_tasks}")
+        if app["node_type"] == "sn" and app["node_state"] == "READY":
+            # run in the background so a slow DN doesn't hold up the health check
+            prewarm_task = app["prewarm_task"]
+            if prewarm_task is None or prewarm_task.done():
+                app["prewarm_task"] = asyncio.ensure_future(prewarmDataNodeConnections(app))
+
+        if config.get("log_level") == "DEBUG":
+            # only gather these stats when they'll be logged - the health check
+            # runs on the same loop that serves requests
+            svmem = psutil.virtual_memory()
+            all_tasks = asyncio.Task.all_tasks()
+            num_tasks = len(all_tasks)
+            active_tasks = len([task for task in all_tasks if not task.done()])
+            log.debug(f"health check sleep: {sleep_secs}, vm: {svmem.percent} num tasks: {num_tasks} active tasks: {active_tasks}")
         await asyncio.sleep(sleep_secs)
 
+async def stopBackgroundTasks(app):
+    """ Cancel the node's background tasks on shutdown and wait for them to finish """
+    bg_tasks = app["bg_tasks"]
+    tasks = list(bg_tasks)
+    prewarm_task = app["prewarm_task"]  # started by healthCheck as needed
+    if prewarm_task is not None and not prewarm_task.done():
+        tasks.append(prewarm_task)
+    if not tasks:
+        return
+    log.info(f"cancelling {len(tasks)} background tasks")
+    for task in tasks:
+        task.cancel()
+    # wait for all the tasks together rather than one after another.  The wait
+    # is bounded since a task cancelled inside an http request can get the
+    # CancelledError turned into an HTTP error and keep looping
+    done, pending = await asyncio.wait(tasks, timeout=5.0)
+    for task in done:
+        if not task.cancelled():
+            task.exception()  # mark as retrieved
+    if pending:
+        log.warn(f"{len(pending)} background tasks did not stop, continuing shutdown")
+    bg_tasks.clear()
+    app["prewarm_task"] = None
+
 async def preStop(request):
     """ HTTP Method used by K8s to signal the container is shutting down """
 
@@ -605,7 +661,7 @@ async def info(request):
 def baseInit(loop, node_type):
     """Intitialize application and return app object"""
     log.info("Application baseInit")
-    app = Application(loop=loop)
+    app = Application()
 
     # set a bunch of global state
     node_id = createNodeId(node_type)
@@ -627,6 +683,8 @@ def baseInit(loop, node_type):
     app["bucket_name"] = bucket_name
     app["sn_urls"] = {}
     app["dn_urls"] = {}
+    app["prewarmed_dn_urls"] = set()  # dn urls the shared http client has connected to
+    app["prewarm_task"] = None  # in-progress prewarmDataNodeConnections task
     counter = {}
     counter["GET"] = 0
     counter["PUT"] = 0
@@ -657,6 +715,9 @@ def baseInit(loop, node_type):
     log.app = app
 
     app["loop"] = loop  # save loop instance
+    app["bg_tasks"] = []  # periodic tasks (health check, etc.) to be cancelled on shutdown
+    app.on_shutdown.append(stopBackgroundTasks)
+    app.on_cleanup.append(release_http_client)
 
     app.router.add_get('/info', info)
     app.router.add_get('/about', about)
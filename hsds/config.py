@@ -37,7 +37,9 @@ cfg = {
     'target_sn_count': 4,
     'target_dn_count': 4,
     'log_level': 'INFO',   # ERROR, WARNING, INFO, DEBUG, or NOTSET,
-    'max_tcp_connections': 100,
+    'max_tcp_connections': 100,  # max number of connections to keep open per host for inter-node requests
+    'tcp_keepalive_timeout': 60,  # seconds to keep idle inter-node connections open for reuse - keep below the aiohttp server's 75s keepalive_timeout
+    'dns_cache_ttl': 10,  # seconds to cache host name lookups for inter-node requests
     'head_sleep_time': 10,
     'node_sleep_time': 10,
     'async_sleep_time': 10,
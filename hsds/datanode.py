@@ -13,6 +13,10 @@
 # data node of hsds cluster
 #
 import asyncio
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 from aiohttp.web import run_app
 import config
@@ -165,6 +169,9 @@ async def bucketGC(app):
 
 def main():
     log.info("datanode start")
+    if uvloop:
+        log.info("using uvloop event loop")
+        uvloop.install()
     loop = asyncio.get_event_loop()
 
     metadata_mem_cache_size = int(config.get("metadata_mem_cache_size"))
@@ -193,16 +200,16 @@ def main():
     # delete entire map whenver the synch queue is empty?
 
     # run background tasks
-    asyncio.ensure_future(healthCheck(app), loop=loop)
+    app["bg_tasks"].append(asyncio.ensure_future(healthCheck(app), loop=loop))
 
     # run data sync tasks
-    asyncio.ensure_future(s3syncCheck(app), loop=loop)
+    app["bg_tasks"].append(asyncio.ensure_future(s3syncCheck(app), loop=loop))
 
     # run root scan
-    asyncio.ensure_future(bucketScan(app), loop=loop)
+    app["bg_tasks"].append(asyncio.ensure_future(bucketScan(app), loop=loop))
 
     # run root/dataset GC
-    asyncio.ensure_future(bucketGC(app), loop=loop)
+    app["bg_tasks"].append(asyncio.ensure_future(bucketGC(app), loop=loop))
 
     # run the app
     port = int(config.get("dn_port"))
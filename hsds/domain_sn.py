@@ -30,7 +30,7 @@ from util.authUtil import validateUserPassword, getAclKeys
 from util.domainUtil import getParentDomain, getDomainFromRequest, isValidDomain, getBucketForDomain, getPathForDomain
 from util.storUtil import getStorKeys
 from util.boolparser import BooleanParser
-from servicenode_lib import getDomainJson, getObjectJson, getObjectIdByPath, getRootInfo
+from servicenode_lib import getDomainJson, getObjectJson, getObjectIdByPath, getRootInfo, invalidateDomainJson
 from basenode import getVersion
 import hsds_logger as log
 import config
@@ -945,10 +945,7 @@ async def DELETE_Domain(request):
     log.info(f"meta_only domain delete: {meta_only}")
     if meta_only:
         # remove from domain cache if present
-        domain_cache = app["domain_cache"]
-        if domain in domain_cache:
-            log.info(f"deleting {domain} from domain_cache")
-            del domain_cache[domain]
+        invalidateDomainJson(app, domain)
         resp = await jsonResponse(request, {})
         return resp
 
@@ -1010,9 +1007,7 @@ async def DELETE_Domain(request):
         await http_delete(app, req, params=params)
 
     # remove from domain cache if present
-    domain_cache = app["domain_cache"]
-    if domain in domain_cache:
-        del domain_cache[domain]
+    invalidateDomainJson(app, domain)
 
     # delete domain cache from other sn_urls
     sn_urls = app["sn_urls"]
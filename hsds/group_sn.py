@@ -13,56 +13,56 @@
 # service node of hsds cluster
 #
 
-import json
+import asyncio
 
-from aiohttp.web_exceptions import HTTPBadRequest, HTTPForbidden, HTTPNotFound
+from aiohttp.web_exceptions import HTTPBadRequest, HTTPForbidden, HTTPNotFound, HTTPConflict, HTTPServiceUnavailable
 
-from util.httpUtil import http_post, http_put, http_delete, getHref, jsonResponse
+from util.httpUtil import http_post, http_put, http_delete, getHref, jsonResponse, jsonLoads
 from util.idUtil import   isValidUuid, getDataNodeUrl, createObjId
 from util.authUtil import getUserPasswordFromRequest, aclCheck, validateUserPassword
 from util.domainUtil import  getDomainFromRequest, isValidDomain, getBucketForDomain, getPathForDomain
 from servicenode_lib import getDomainJson, getObjectJson, validateAction, getObjectIdByPath, getPathForObjectId
 import hsds_logger as log
 
+# (rel, uri) templates for the hrefs returned by GET_Group
+GROUP_HREF_TEMPLATES = (
+    ("self", "/groups/{group_id}"),
+    ("links", "/groups/{group_id}/links"),
+    ("root", "/groups/{root_id}"),
+    ("home", "/"),
+    ("attributes", "/groups/{group_id}/attributes")
+)
 
 async def GET_Group(request):
     """HTTP method to return JSON for group"""
     log.request(request)
     app = request.app
-    params = request.rel_url.query
+    params = dict(request.query)  # snapshot query params for the lookups below
 
-    h5path = None
+    h5path = params.get("h5path")
     getAlias = False
-    include_links = False
-    include_attrs = False
+    include_links = bool(params.get("include_links"))
+    include_attrs = bool(params.get("include_attrs"))
     group_id = request.match_info.get('id')
-    if not group_id and "h5path" not in params:
+    if not group_id and not h5path:
         # no id, or path provided, so bad request
         msg = "Missing group id"
         log.warn(msg)
         raise HTTPBadRequest(reason=msg)
     if group_id:
-        log.info(f"GET_Group, id: {group_id}")
+        log.info("GET_Group, id: %s", group_id)
         # is the id a group id and not something else?
         if not isValidUuid(group_id, "Group"):
             msg = f"Invalid group id: {group_id}"
             log.warn(msg)
             raise HTTPBadRequest(reason=msg)
-        if "getalias" in params:
-            if params["getalias"]:
-                getAlias = True
-    if "h5path" in params:
-        h5path = params["h5path"]
+        getAlias = bool(params.get("getalias"))
+    if h5path:
         if not group_id and h5path[0] != '/':
             msg = "h5paths must be absolute if no parent id is provided"
             log.warn(msg)
             raise HTTPBadRequest(reason=msg)
-        log.info(f"GET_Group, h5path: {h5path}")
-    if "include_links" in params and params["include_links"]:
-        include_links = True
-    if "include_attrs" in params and params["include_attrs"]:
-        include_attrs = True
-
+        log.info("GET_Group, h5path: %s", h5path)
 
     username, pswd = getUserPasswordFromRequest(request)
     if username is None and app['allow_noauth']:
@@ -77,6 +77,7 @@ async def GET_Group(request):
         raise HTTPBadRequest(reason=msg)
     bucket = getBucketForDomain(domain)
 
+    domain_json = None
     if h5path and h5path[0] == '/':
         # ignore the request path id (if given) and start
         # from root group for absolute paths
@@ -94,14 +95,22 @@ async def GET_Group(request):
             msg = f"No group exist with the path: {h5path}"
             log.warn(msg)
             raise HTTPNotFound()
-        log.info(f"get group_id: {group_id} from h5path: {h5path}")
-
-    # verify authorization to read the group
-    await validateAction(app, domain, group_id, username, "read")
-
-    # get authoritative state for group from DN (even if it's in the meta_cache).
-    group_json = await getObjectJson(app, group_id, refresh=True, include_links=include_links, include_attrs=include_attrs, bucket=bucket)
-    log.debug(f"domain from request: {domain}")
+        log.info("get group_id: %s from h5path: %s", group_id, h5path)
+
+    # verify authorization to read the group and get authoritative state for
+    # group from DN (even if it's in the meta_cache).
+    if include_links or include_attrs:
+        # fetching links or attributes can be expensive, so don't have the DN
+        # do the work until we know the action is allowed
+        await validateAction(app, domain, group_id, username, "read", domain_json=domain_json)
+        group_json = await getObjectJson(app, group_id, refresh=True, include_links=include_links, include_attrs=include_attrs, bucket=bucket)
+    else:
+        # run the check and the fetch concurrently - group_json is only
+        # returned if the action is allowed.
+        _, group_json = await asyncio.gather(
+            validateAction(app, domain, group_id, username, "read", domain_json=domain_json),
+            getObjectJson(app, group_id, refresh=True, bucket=bucket))
+    log.debug("domain from request: %s", domain)
     group_json["domain"] = getPathForDomain(domain)
     if bucket:
         group_json["bucket"] = bucket
@@ -118,15 +127,11 @@ async def GET_Group(request):
                 alias.append(h5path)
         group_json["alias"] = alias
 
-    hrefs = []
-    group_uri = '/groups/'+group_id
-    hrefs.append({'rel': 'self', 'href': getHref(request, group_uri)})
-    hrefs.append({'rel': 'links', 'href': getHref(request, group_uri+'/links')})
-    root_uri = '/groups/' + group_json["root"]
-    hrefs.append({'rel': 'root', 'href': getHref(request, root_uri)})
-    hrefs.append({'rel': 'home', 'href': getHref(request, '/')})
-    hrefs.append({'rel': 'attributes', 'href': getHref(request, group_uri+'/attributes')})
-    group_json["hrefs"] = hrefs
+    root_id = group_json["root"]
+    group_json["hrefs"] = [
+        {'rel': rel, 'href': getHref(request, uri.format(group_id=group_id, root_id=root_id))}
+        for rel, uri in GROUP_HREF_TEMPLATES
+    ]
 
     resp = await jsonResponse(request, group_json)
     log.response(request, resp=resp)
@@ -160,48 +165,83 @@ async def POST_Group(request):
     link_id = None
     link_title = None
     if request.has_body:
-        body = await request.json()
-        log.info(f"POST Group body: {body}")
+        body = await request.json(loads=jsonLoads)
+        log.info("POST Group body: %s", body)
         if body:
             if "link" in body:
                 link_body = body["link"]
-                log.debug(f"link_body: {link_body}")
+                log.debug("link_body: %s", link_body)
                 if "id" in link_body:
                     link_id = link_body["id"]
                 if "name" in link_body:
                     link_title = link_body["name"]
                 if link_id and link_title:
-                    log.debug(f"link id: {link_id}")
-                    # verify that the referenced id exists and is in this domain
-                    # and that the requestor has permissions to create a link
-                    await validateAction(app, domain, link_id, username, "create")
+                    log.debug("link id: %s", link_id)
             if not link_id or not link_title:
-                log.warn(f"POST Group body with no link: {body}")
-
-    domain_json = await getDomainJson(app, domain) # get again in case cache was invalidated
+                log.warn("POST Group body with no link: %s", body)
 
     root_id = domain_json["root"]
     group_id = createObjId("groups", rootid=root_id)
-    log.info(f"new  group id: {group_id}")
+    log.info("new  group id: %s", group_id)
     group_json = {"id": group_id, "root": root_id }
-    log.debug("create group, body: " + json.dumps(group_json))
+    log.debug("create group, body: %s", group_json)
     req = getDataNodeUrl(app, group_id) + "/groups"
-    params = {}
-    if bucket:
-        params["bucket"] = bucket
+    params = {"bucket": bucket} if bucket else None
 
-    group_json = await http_post(app, req, data=group_json, params=params)
+    async def deleteGroup():
+        # remove the new group when the link to it can't be created
+        log.info("deleting unlinked group: %s", group_id)
+        delete_req = getDataNodeUrl(app, group_id) + "/groups/" + group_id
+        try:
+            await http_delete(app, delete_req, params=params)
+        except Exception as e:
+            log.warn("unable to delete group %s: %s", group_id, e)
 
-    # create link if requested
     if link_id and link_title:
-        link_json={}
-        link_json["id"] = group_id
-        link_json["class"] = "H5L_TYPE_HARD"
+        # create the group while verifying that the referenced id exists and is
+        # in this domain and that the requestor has permissions to create a link
+        # the create runs as a shielded task so that its outcome is known (and a
+        # new group can be removed) even if this request is cancelled part way
+        create_task = asyncio.ensure_future(http_post(app, req, data=group_json, params=params))
+        try:
+            _, validate_rsp = await asyncio.gather(
+                asyncio.shield(create_task),
+                validateAction(app, domain, link_id, username, "create", domain_json=domain_json),
+                return_exceptions=True)
+        except asyncio.CancelledError as ce:
+            validate_rsp = ce
+        # wait for the DN to respond to the create if it hasn't yet
+        await asyncio.wait([create_task])
+        if not isinstance(validate_rsp, BaseException) and validate_rsp["root"] != root_id:
+            # validateAction reloaded the domain and it has a new root
+            log.warn("domain root changed while creating group: %s", group_id)
+            validate_rsp = HTTPConflict()
+        if isinstance(validate_rsp, BaseException):
+            if create_task.exception() is None:
+                # the link can't be created, so remove the new group
+                await asyncio.shield(deleteGroup())
+            raise validate_rsp
+        if create_task.exception() is not None:
+            raise create_task.exception()
+        group_json = create_task.result()
+
+        # create link to the new group
+        link_json = {"id": group_id, "class": "H5L_TYPE_HARD"}
         link_req = getDataNodeUrl(app, link_id)
         link_req += "/groups/" + link_id + "/links/" + link_title
-        log.debug("PUT link - : " + link_req)
-        put_json_rsp = await http_put(app, link_req, data=link_json, params=params)
-        log.debug(f"PUT Link resp: {put_json_rsp}")
+        log.debug("PUT link - : %s", link_req)
+        try:
+            put_json_rsp = await http_put(app, link_req, data=link_json, params=params)
+        except (HTTPConflict, HTTPServiceUnavailable):
+            # the DN rejected the link, so remove the new group.  For other
+            # errors (e.g. timeouts) the link may have been written, and an
+            # unlinked group is better than a link to a deleted one
+            await asyncio.shield(deleteGroup())
+            raise
+        log.debug("PUT Link resp: %s", put_json_rsp)
+    else:
+        group_json = await http_post(app, req, data=group_json, params=params)
+
     log.debug("returning resp")
     # group creation successful
     resp = await jsonResponse(request, group_json, status=201)
@@ -241,7 +281,7 @@ async def DELETE_Group(request):
     await validateAction(app, domain, group_id, username, "delete")
 
     if "root" not in domain_json:
-        log.error(f"Expected root key for domain: {domain}")
+        log.error("Expected root key for domain: %s", domain)
         raise HTTPBadRequest(reason="Unexpected Error")
 
     if group_id == domain_json["root"]:
@@ -251,15 +291,12 @@ async def DELETE_Group(request):
 
     req = getDataNodeUrl(app, group_id)
     req += "/groups/" + group_id
-    params = {}
-    if bucket:
-        params["bucket"] = bucket
-    log.debug(f"http_delete req: {req} params: {params}")
+    params = {"bucket": bucket} if bucket else None
+    log.debug("http_delete req: %s params: %s", req, params)
 
     await http_delete(app, req, params=params)
 
-    if group_id in meta_cache:
-        del meta_cache[group_id]  # remove from cache
+    meta_cache.pop(group_id)  # remove from cache
 
     resp = await jsonResponse(request, {})
     log.response(request, resp=resp)
@@ -15,6 +15,10 @@
 import asyncio
 import json
 import time
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 from aiohttp.web import Application, StreamResponse, run_app, json_response
 from aiohttp.web_exceptions import HTTPBadRequest, HTTPInternalServerError
@@ -23,7 +27,7 @@ from asyncio import TimeoutError
 
 import config
 from util.timeUtil import unixTimeToUTC, elapsedTime
-from util.httpUtil import http_get, getUrl
+from util.httpUtil import http_get, getUrl, release_http_client
 from util.idUtil import  createNodeId
 import hsds_logger as log
 
@@ -375,6 +379,7 @@ def init():
     app.router.add_get('/nodeinfo/{statkey}', nodeinfo)
     app.router.add_get('/info', info)
     app.router.add_post('/register', register)
+    app.on_cleanup.append(release_http_client)
 
     return app
 
@@ -384,6 +389,9 @@ def init():
 
 if __name__ == '__main__':
     log.info("Head node initializing")
+    if uvloop:
+        log.info("using uvloop event loop")
+        uvloop.install()
     loop = asyncio.get_event_loop()
     app = init()  
 
@@ -18,36 +18,42 @@ from aiohttp.web_exceptions import HTTPServiceUnavailable
 from util.domainUtil import getDomainFromRequest
 app = None # global app handle
 
-def debug(msg):
+def _format(msg, args):
+	# %-style args are only formatted when the message is actually logged
+	if args:
+		return msg % args
+	return msg
+
+def debug(msg, *args):
 	if config.get("log_level") == "DEBUG":
-		print("DEBUG> " + msg)
+		print("DEBUG> " + _format(msg, args))
 	if app:
 		counter = app["log_count"]
 		counter["DEBUG"] += 1
 
-def info(msg):
+def info(msg, *args):
 	if config.get("log_level") not in  ("ERROR", "WARNING", "WARN"):
-		print("INFO> " + msg)
+		print("INFO> " + _format(msg, args))
 	if app:
 		counter = app["log_count"]
 		counter["INFO"] += 1
 
-def warn(msg):
+def warn(msg, *args):
 	if config.get("log_level") != "ERROR":
-		print("WARN> " + msg)
+		print("WARN> " + _format(msg, args))
 	if app:
 		counter = app["log_count"]
 		counter["WARN"] += 1
 
-def warning(msg):
+def warning(msg, *args):
 	if config.get("log_level") != "ERROR":
-		print("WARN> " + msg)
+		print("WARN> " + _format(msg, args))
 	if app:
 		counter = app["log_count"]
 		counter["WARN"] += 1
 
-def error(msg):
-	print("ERROR> " + msg)
+def error(msg, *args):
+	print("ERROR> " + _format(msg, args))
 	if app:
 		counter = app["log_count"]
 		counter["ERROR"] += 1
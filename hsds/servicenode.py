@@ -13,6 +13,10 @@
 # service node of hsds cluster
 #
 import asyncio
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 from aiohttp.web import  run_app
 from util.lruCache import LruCache
@@ -141,6 +145,9 @@ async def init(loop):
 
 def main():
     log.info("Service node initializing")
+    if uvloop:
+        log.info("using uvloop event loop")
+        uvloop.install()
     loop = asyncio.get_event_loop()
     #create the app object
     app = loop.run_until_complete(init(loop))
@@ -149,6 +156,7 @@ def main():
     log.info("Using metadata memory cache size of: {}".format(metadata_mem_cache_size))
     app['meta_cache'] = LruCache(mem_target=metadata_mem_cache_size, chunk_cache=False)
     app['domain_cache'] = LruCache(mem_target=metadata_mem_cache_size, chunk_cache=False)
+    app['pending_domain_req'] = {}  # map of domain to future for in-flight getDomainJson requests
 
     app['loop'] = loop
     if config.get("allow_noauth"):
@@ -158,7 +166,7 @@ def main():
 
     initUserDB(app)
 
-    asyncio.ensure_future(healthCheck(app), loop=loop)
+    app["bg_tasks"].append(asyncio.ensure_future(healthCheck(app), loop=loop))
 
     # run the app
     port = int(config.get("sn_port"))
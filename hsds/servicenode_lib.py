@@ -12,6 +12,7 @@
 #
 # service node of hsds cluster
 #
+import asyncio
 import os.path as op
 from aiohttp.web_exceptions import HTTPBadRequest, HTTPForbidden, HTTPNotFound, HTTPInternalServerError
 
@@ -39,6 +40,7 @@ async def getDomainJson(app, domain, reload=False):
         raise HTTPInternalServerError()
 
     domain_cache = app["domain_cache"]
+    pending_domain_req = app["pending_domain_req"]
 
     if domain in domain_cache:
         if reload:
@@ -47,6 +49,47 @@ async def getDomainJson(app, domain, reload=False):
             log.debug("returning domain_cache value")
             return domain_cache[domain]
 
+    if not reload and domain in pending_domain_req:
+        # another task is already fetching this domain, share its result
+        log.debug("waiting on pending domain request")
+        task = pending_domain_req[domain]
+    else:
+        # run the fetch as its own task so that a cancelled caller doesn't
+        # cancel the request for every other caller waiting on it
+        task = asyncio.ensure_future(getDomainJsonFromDN(app, domain))
+        pending_domain_req[domain] = task
+        task.add_done_callback(lambda t: _domainFetchDone(app, domain, t))
+
+    domain_json = await asyncio.shield(task)
+    return domain_json
+
+def _domainFetchDone(app, domain, task):
+    """ done callback for getDomainJson fetch tasks - remove the pending
+        entry and add the result to the domain cache
+    """
+    # calling exception() marks it as retrieved in case there are no waiters
+    failed = task.cancelled() or task.exception() is not None
+    pending_domain_req = app["pending_domain_req"]
+    if pending_domain_req.get(domain) is not task:
+        # replaced by a reload fetch or invalidated - don't cache a stale result
+        return
+    del pending_domain_req[domain]
+    if failed:
+        return
+    app["domain_cache"][domain] = task.result()
+
+def invalidateDomainJson(app, domain):
+    """ Remove the domain from the domain cache and drop any pending fetch,
+        so that the next getDomainJson call gets the domain from the DN
+    """
+    domain_cache = app["domain_cache"]
+    if domain in domain_cache:
+        log.info(f"deleting {domain} from domain_cache")
+        del domain_cache[domain]
+    app["pending_domain_req"].pop(domain, None)
+
+async def getDomainJsonFromDN(app, domain):
+    """ Fetch domain JSON from the DN for the given domain """
     req = getDataNodeUrl(app, domain)
     req += "/domains"
     params = { "domain": domain }
@@ -63,18 +106,21 @@ async def getDomainJson(app, domain, reload=False):
         log.warn("No acls key found in domain")
         raise HTTPInternalServerError()
 
-    domain_cache[domain] = domain_json  # add to cache
     return domain_json
 
-async def validateAction(app, domain, obj_id, username, action):
+async def validateAction(app, domain, obj_id, username, action, domain_json=None):
     """ check that the given object belongs in the domain and that the
         requested action (create, read, update, delete, readACL, udpateACL)
         is permitted for the requesting user.
+        If domain_json is given, it is used rather than fetching the domain again.
+        Returns the domain JSON used for the check (this will be the reloaded
+        value if the domain needed to be refetched).
     """
     meta_cache = app['meta_cache']
     log.info(f"validateAction(domain={domain}, obj_id={obj_id}, username={username}, action={action})")
-    # get domain JSON
-    domain_json = await getDomainJson(app, domain)
+    if domain_json is None:
+        # get domain JSON
+        domain_json = await getDomainJson(app, domain)
     if "root" not in domain_json:
         msg = f"Expected root key for domain: {domain}"
         log.warn(msg)
@@ -119,6 +165,8 @@ async def validateAction(app, domain, obj_id, username, action):
         domain_json = await getDomainJson(app, domain, reload=True)
         aclCheck(domain_json, action, username)
 
+    return domain_json
+
 
 async def getObjectJson(app, obj_id, bucket=None, refresh=False, include_links=False, include_attrs=False):
     """ Return top-level json (i.e. excluding attributes or links by default) for a given obj_id.
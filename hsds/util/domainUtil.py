@@ -176,6 +176,18 @@ def getDomainForHost(host_value):
     return domain
 
 def getDomainFromRequest(request, validate=True):
+    """ Return the domain for the request.
+        Validated domains are saved on the request so that later calls
+        for the same request don't need to re-parse the query/headers.
+    """
+    if "domain" in request:
+        return request["domain"]
+    if not validate:
+        # try the validating parse first so the result can be saved
+        try:
+            return getDomainFromRequest(request)
+        except ValueError:
+            pass  # fall back to the non-validating parse
     app = request.app
     domain = None
     bucket = None
@@ -224,6 +236,9 @@ def getDomainFromRequest(request, validate=True):
         if domain[0] == '/':
             domain = bucket + domain
 
+    if validate:
+        request["domain"] = domain
+
     return domain
 
 def getPathForDomain(domain):
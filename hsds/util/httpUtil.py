@@ -13,8 +13,14 @@
 # httpUtil:
 # http-related helper functions
 #
+import json
+import math
 from asyncio import CancelledError
-from aiohttp.web import json_response
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from aiohttp.web import Response
 from aiohttp import  ClientSession, TCPConnector
 from aiohttp.web_exceptions import HTTPForbidden, HTTPNotFound, HTTPConflict, HTTPGone, HTTPInternalServerError, HTTPRequestEntityTooLarge, HTTPServiceUnavailable
 from aiohttp.client_exceptions import ClientError
@@ -49,12 +55,32 @@ def get_http_client(app):
         raise KeyError("loop not initialized")
     loop = app["loop"]
     max_tcp_connections = int(config.get("max_tcp_connections"))
-    log.info(f"Initiating TCPConnector with limit {max_tcp_connections} connections")
-    client = ClientSession(loop=loop, connector=TCPConnector(limit_per_host=max_tcp_connections))
+    keepalive_timeout = int(config.get("tcp_keepalive_timeout"))
+    dns_cache_ttl = int(config.get("dns_cache_ttl"))
+    log.info(f"Initiating TCPConnector with limit {max_tcp_connections} connections per host, keepalive: {keepalive_timeout}s")
+    # no overall limit - the set of hosts (head/dn/sn nodes) is small and
+    # fixed, so cap connections per host and keep idle sockets around long
+    # enough that they get reused between requests
+    connector = TCPConnector(limit=0,
+                             limit_per_host=max_tcp_connections,
+                             keepalive_timeout=keepalive_timeout,
+                             use_dns_cache=True,
+                             ttl_dns_cache=dns_cache_ttl,
+                             enable_cleanup_closed=True)
+    client = ClientSession(loop=loop, connector=connector)
     #create the app object
     app['client'] = client
     return client
 
+async def release_http_client(app):
+    """ release the shared http client (if any) """
+    if "client" not in app:
+        return
+    client = app["client"]
+    del app["client"]
+    log.info("closing shared http client")
+    await client.close()
+
 
 """
 Replacement for aiohttp Request.read using our max request limit
@@ -240,25 +266,23 @@ Helper function  - async HTTP DELETE
 async def http_delete(app, url, data=None, params=None):
     # TBD - do we really need a data param?
     log.info(f"http_delete('{url}')")
-    #client = get_http_client(app)
+    client = get_http_client(app)
     rsp_json = None
     timeout = config.get("timeout")
-    import aiohttp
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(url, json=data, params=params, timeout=timeout) as rsp:
-                log.info(f"http_delete status: {rsp.status}")
-                if rsp.status == 200:
-                    pass  # expectred
-                elif rsp.status == 404:
-                    log.info(f"NotFound response for DELETE for url: {url}")
-                elif rsp.status == 503:
-                    log.warn(f"503 error for http_delete {url}")
-                    raise HTTPServiceUnavailable()
-                else:
-                    log.error(f"DELETE request error for url: {url} - status: {rsp.status}")
-                    raise HTTPInternalServerError()
+        async with client.delete(url, json=data, params=params, timeout=timeout) as rsp:
+            log.info(f"http_delete status: {rsp.status}")
+            if rsp.status == 200:
+                pass  # expectred
+            elif rsp.status == 404:
+                log.info(f"NotFound response for DELETE for url: {url}")
+            elif rsp.status == 503:
+                log.warn(f"503 error for http_delete {url}")
+                raise HTTPServiceUnavailable()
+            else:
+                log.error(f"DELETE request error for url: {url} - status: {rsp.status}")
+                raise HTTPInternalServerError()
 
             #rsp_json = await rsp.json()
             #log.debug(f"http_delete({url}) response: {rsp_json}")
@@ -274,6 +298,51 @@ async def http_delete(app, url, data=None, params=None):
 
     return rsp_json
 
+"""
+Return True if data contains a NaN or Infinity float value
+"""
+def hasNonFiniteFloat(data):
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+"""
+Encode data as JSON bytes.  Uses orjson if available, but falls back
+to the json module where the two differ (orjson writes NaN and Infinity
+values as null and doesn't support all the key types json does)
+"""
+def jsonDumps(data):
+    if orjson:
+        try:
+            body = orjson.dumps(data)
+            # a NaN or Infinity value will show up as null, only check the
+            # data for those (rather than re-encoding) when there is one
+            if body.find(b"null") == -1 or not hasNonFiniteFloat(data):
+                return body
+        except TypeError:
+            pass  # unsupported type for orjson
+    return json.dumps(data).encode("utf-8")
+
+"""
+Decode JSON text.  Uses orjson if available, but falls back to
+the json module for input orjson doesn't accept (e.g. NaN values)
+"""
+def jsonLoads(text):
+    if orjson:
+        try:
+            return orjson.loads(text)
+        except ValueError:
+            pass  # let json module decide if this is valid
+    return json.loads(text)
+
 """
 Helper funciton, create a response object using the provided
 JSON data
@@ -285,29 +354,55 @@ async def jsonResponse(request, data, status=200):
         headers['Access-Control-Allow-Origin'] = CORS_DOMAIN
         headers['Access-Control-Allow-Methods'] = "GET, POST, DELETE, PUT, OPTIONS"
         headers['Access-Control-Allow-Headers'] = "Content-Type, api_key, Authorization"
-    resp = json_response(data, headers=headers, status=status)
+    body = jsonDumps(data)
+    resp = Response(body=body, headers=headers, status=status, content_type="application/json", charset="utf-8")
 
     return resp
 
+"""
+Return the endpoint prefix used for href links.  The value is saved on the
+request so it's only computed once per request.
+"""
+def getHrefBase(request):
+    if "href_base" in request:
+        return request["href_base"]
+    href_base = config.get("hsds_endpoint")
+    if not href_base:
+        href_base = request.scheme + "://127.0.0.1"
+    request["href_base"] = href_base
+    return href_base
+
+"""
+Return the domain query string (if any) for href links.  Like getHrefBase,
+the value is saved on the request.
+"""
+def getHrefDomainQuery(request):
+    if "href_domain_query" in request:
+        return request["href_domain_query"]
+    params = request.rel_url.query
+    if "domain" in params:
+        domain_query = "?domain=" + params["domain"]
+    elif "host" in params:
+        domain_query = "?host=" + params["host"]
+    else:
+        domain_query = ""
+    request["href_domain_query"] = domain_query
+    return domain_query
+
 """
 Convience method to compute href links
 """
 def getHref(request, uri, query=None, domain=None):
-    params = request.rel_url.query
-    href = config.get("hsds_endpoint")
-    if not href:
-        href = request.scheme + "://127.0.0.1"
-    href += uri
+    href = getHrefBase(request) + uri
     delimiter = '?'
     if domain:
         href += "?domain=" + domain
         delimiter = '&'
-    elif "domain" in params:
-        href += "?domain=" + params["domain"]
-        delimiter = '&'
-    elif "host" in params:
-        href  += "?host=" + params["host"]
-        delimiter = '&'
+    else:
+        domain_query = getHrefDomainQuery(request)
+        if domain_query:
+            href += domain_query
+            delimiter = '&'
 
     if query is not None:
         if type(query) is str:
@@ -15,6 +15,7 @@
 #
 import hashlib
 import uuid
+from functools import lru_cache
 from aiohttp.web_exceptions import HTTPServiceUnavailable
 
 import hsds_logger as log
@@ -328,20 +329,25 @@ def validateUuid(id, obj_class=None):
         # id should be 36 now
         raise ValueError("Unexpected id length")
 
-    for ch in id:
-        if ch.isalnum():
-            continue
-        if ch == '-':
-            continue
-        raise ValueError(f"Unexpected character in uuid: {ch}")
+    if not id.replace('-', '').isalnum():
+        for ch in id:
+            if not ch.isalnum() and ch != '-':
+                raise ValueError(f"Unexpected character in uuid: {ch}")
 
-def isValidUuid(id, obj_class=None):
+@lru_cache(maxsize=4096)
+def _isValidUuid(id, obj_class):
     try:
         validateUuid(id, obj_class)
         return True
     except ValueError:
         return False
 
+def isValidUuid(id, obj_class=None):
+    if not isinstance(id, str):
+        return False
+    # ids tend to be checked repeatedly, so results are cached
+    return _isValidUuid(id, obj_class)
+
 def isValidChunkId(id):
     if not isValidUuid(id):
         return False
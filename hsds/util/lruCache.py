@@ -109,6 +109,15 @@ class LruCache(object):
             self._dirty_set.remove(key)
             self._dirty_size -= node._mem_size
 
+    def pop(self, key, default=None):
+        """ Remove key from the cache and return its data, or default if
+        key is not in the cache """
+        if key not in self._hash:
+            return default
+        data = self._hash[key]._data
+        del self[key]
+        return data
+
     def __len__(self):
         """ Number of nodes in the cache """
         return len(self._hash)
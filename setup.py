@@ -21,7 +21,7 @@ setup(name='hsds',
       license='BSD',
       packages=['hsds', 'hsds.util'],
       # requires=['h5py (>=2.5.0)', 'h5json>=1.0.2'],
-      install_requires=['numpy >= 1.10.4', 'requests', 'six', 'pytz'],
+      install_requires=['numpy >= 1.10.4', 'requests', 'six', 'pytz', 'uvloop; platform_system != "Windows"', 'orjson'],
       setup_requires=['pkgconfig', 'six'],
       zip_safe=False,
       # not compatible
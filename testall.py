@@ -15,7 +15,7 @@ import sys
 
 
 unit_tests = ('arrayUtilTest', 'chunkUtilTest', 'domainUtilTest',
-    'dsetUtilTest', 'hdf5dtypeTest', 'idUtilTest', 'lruCacheTest')
+    'dsetUtilTest', 'hdf5dtypeTest', 'idUtilTest', 'httpUtilTest', 'lruCacheTest', 'servicenodeLibTest')
 
 integ_tests = ('uptest', 'setup_test', 'domain_test', 'group_test', 'link_test',
  'attr_test', 'datatype_test', 'dataset_test', 'acl_test', 'value_test', 'pointsel_test', 'query_test', 'vlen_test' )
@@ -0,0 +1,92 @@
+##############################################################################
+# Copyright by The HDF Group.                                                #
+# All rights reserved.                                                       #
+#                                                                            #
+# This file is part of HSDS (HDF5 Scalable Data Service), Libraries and      #
+# Utilities.  The full HSDS copyright notice, including                      #
+# terms governing use, modification, and redistribution, is contained in     #
+# the file COPYING, which can be found at the root of the source code        #
+# distribution tree.  If you do not have access to this file, you may        #
+# request a copy from help@hdfgroup.org.                                     #
+##############################################################################
+import unittest
+import json
+import math
+import sys
+
+sys.path.append('../../hsds/util')
+sys.path.append('../../hsds')
+
+from httpUtil import jsonDumps, jsonLoads, hasNonFiniteFloat
+
+
+class HttpUtilTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super(HttpUtilTest, self).__init__(*args, **kwargs)
+        # main
+
+    def testJsonDumps(self):
+        data = {"id": "g-1234", "count": 3, "created": 1.5, "links": ["a", "b"]}
+        body = jsonDumps(data)
+        self.assertTrue(isinstance(body, bytes))
+        self.assertEqual(json.loads(body), data)
+
+        # null values that aren't from NaN floats
+        data = {"root": None, "values": [1.5, None, 2.5], "title": "null"}
+        body = jsonDumps(data)
+        self.assertEqual(json.loads(body), data)
+
+    def testJsonDumpsNonFinite(self):
+        data = {"value": [1.0, float("nan"), 3.0]}
+        body = jsonDumps(data)
+        self.assertTrue(body.find(b"NaN") > 0)
+        value = json.loads(body)["value"]
+        self.assertEqual(value[0], 1.0)
+        self.assertTrue(math.isnan(value[1]))
+
+        data = {"fillValue": float("inf"), "shape": {"dims": [10]}, "x": None}
+        body = jsonDumps(data)
+        self.assertTrue(body.find(b"Infinity") > 0)
+        self.assertEqual(json.loads(body), data)
+
+        data = [[1.0, 2.0], [float("-inf"), None]]
+        body = jsonDumps(data)
+        self.assertTrue(body.find(b"-Infinity") > 0)
+        self.assertEqual(json.loads(body), data)
+
+    def testJsonDumpsNonStrKeys(self):
+        data = {1: "a", 2: {"b": 3}}
+        body = jsonDumps(data)
+        self.assertEqual(json.loads(body), {"1": "a", "2": {"b": 3}})
+
+    def testJsonLoads(self):
+        text = '{"id": "g-1234", "count": 3, "root": null}'
+        self.assertEqual(jsonLoads(text), json.loads(text))
+        self.assertEqual(jsonLoads(text.encode("utf-8")), json.loads(text))
+
+        # NaN and Infinity literals aren't standard JSON, but json accepts them
+        data = jsonLoads(b'{"value": [NaN, Infinity, -Infinity, 1.5]}')
+        value = data["value"]
+        self.assertTrue(math.isnan(value[0]))
+        self.assertEqual(value[1], float("inf"))
+        self.assertEqual(value[2], float("-inf"))
+        self.assertEqual(value[3], 1.5)
+
+        try:
+            jsonLoads(b'{"value": [1, 2')
+            self.assertTrue(False)  # expected exception
+        except ValueError:
+            pass  # expected
+
+    def testHasNonFiniteFloat(self):
+        self.assertFalse(hasNonFiniteFloat(None))
+        self.assertFalse(hasNonFiniteFloat({"a": [1, 2.5, None, "nan"], "b": {"c": 0.0}}))
+        self.assertTrue(hasNonFiniteFloat(float("nan")))
+        self.assertTrue(hasNonFiniteFloat({"a": [1, 2, {"b": (3.0, float("inf"))}]}))
+        self.assertTrue(hasNonFiniteFloat([[0.0], [float("-inf")]]))
+
+
+if __name__ == '__main__':
+    #setup test files
+
+    unittest.main()
@@ -81,6 +81,13 @@ class IdUtilTest(unittest.TestCase):
         for item in bad_ids:
             self.assertFalse(isValidUuid(item))
             self.assertFalse(isObjId(item))
+        # repeated calls should give the same (cached) answer
+        for i in range(2):
+            self.assertTrue(isValidUuid(group_id, obj_class="Group"))
+            self.assertFalse(isValidUuid(group_id, obj_class="Dataset"))
+            self.assertFalse(isValidUuid("g-314d61b8-9954-11e6-a733-3c15c2da029!"))
+        for item in (None, 42, ["g-314d61b8-9954-11e6-a733-3c15c2da029e"]):
+            self.assertFalse(isValidUuid(item))
 
 
 
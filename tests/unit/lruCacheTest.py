@@ -248,6 +248,32 @@ class LruCacheTest(unittest.TestCase):
 
         self.assertTrue(mem_per <= 100)
 
+    def testPop(self):
+        """ check removing items with pop """
+        cc = LruCache(mem_target=1024*10, chunk_cache=False)
+        ids = []
+        for i in range(3):
+            id = createObjId("groups")
+            cc[id] = {"index": i}
+            ids.append(id)
+        cc.consistencyCheck()
+        self.assertEqual(len(cc), 3)
+        data = cc.pop(ids[1])
+        self.assertEqual(data, {"index": 1})
+        cc.consistencyCheck()
+        self.assertEqual(len(cc), 2)
+        self.assertFalse(ids[1] in cc)
+        self.assertEqual(cc.memUsed, 2*1024)
+        # popping a missing key returns the default
+        self.assertEqual(cc.pop(ids[1]), None)
+        self.assertEqual(cc.pop(ids[1], "xyz"), "xyz")
+        self.assertEqual(len(cc), 2)
+        for id in (ids[0], ids[2]):
+            cc.pop(id)
+        cc.consistencyCheck()
+        self.assertEqual(len(cc), 0)
+        self.assertEqual(cc.dump_lru(), "->\n<-\n")
+
     def testMetaDataCache(self):
         """ check metadata cache functionality """
         cc = LruCache(mem_target=1024*10, chunk_cache=False)
@@ -0,0 +1,206 @@
+##############################################################################
+# Copyright by The HDF Group.                                                #
+# All rights reserved.                                                       #
+#                                                                            #
+# This file is part of HSDS (HDF5 Scalable Data Service), Libraries and      #
+# Utilities.  The full HSDS copyright notice, including                      #
+# terms governing use, modification, and redistribution, is contained in     #
+# the file COPYING, which can be found at the root of the source code        #
+# distribution tree.  If you do not have access to this file, you may        #
+# request a copy from help@hdfgroup.org.                                     #
+##############################################################################
+import unittest
+import asyncio
+import sys
+from aiohttp.web_exceptions import HTTPNotFound
+
+sys.path.append('../../hsds/util')
+sys.path.append('../../hsds')
+
+import servicenode_lib
+from servicenode_lib import getDomainJson, invalidateDomainJson
+
+
+class ServicenodeLibTest(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super(ServicenodeLibTest, self).__init__(*args, **kwargs)
+        # main
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.fetch_count = 0
+        self.fetch_error = None
+        self.fetch_events = []
+        self.release_all = False
+        self.saved_fetch = servicenode_lib.getDomainJsonFromDN
+        servicenode_lib.getDomainJsonFromDN = self.fakeFetch
+
+    def tearDown(self):
+        servicenode_lib.getDomainJsonFromDN = self.saved_fetch
+        self.loop.close()
+
+    async def fakeFetch(self, app, domain):
+        # stand-in for the DN request, returns once its event is set
+        self.fetch_count += 1
+        version = self.fetch_count
+        event = asyncio.Event()
+        self.fetch_events.append(event)
+        if not self.release_all:
+            await event.wait()
+        if self.fetch_error is not None:
+            raise self.fetch_error
+        return {"owner": "test_user1", "acls": {}, "domain": domain, "version": version}
+
+    def releaseFetches(self):
+        self.release_all = True
+        for event in self.fetch_events:
+            event.set()
+
+    def getApp(self):
+        app = {}
+        app["node_type"] = "sn"
+        app["domain_cache"] = {}
+        app["pending_domain_req"] = {}
+        return app
+
+    def testConcurrentWaiters(self):
+        app = self.getApp()
+        domain = "/home/test_user1/a.h5"
+
+        async def run():
+            tasks = [asyncio.ensure_future(getDomainJson(app, domain)) for _ in range(5)]
+            await asyncio.sleep(0)
+            self.assertTrue(domain in app["pending_domain_req"])
+            self.releaseFetches()
+            return await asyncio.gather(*tasks)
+
+        results = self.loop.run_until_complete(run())
+        self.assertEqual(self.fetch_count, 1)  # only one DN request
+        for domain_json in results:
+            self.assertEqual(domain_json["domain"], domain)
+        self.assertTrue(domain in app["domain_cache"])
+        self.assertFalse(domain in app["pending_domain_req"])
+
+    def testWaiterCancelled(self):
+        app = self.getApp()
+        domain = "/home/test_user1/a.h5"
+
+        async def run():
+            owner = asyncio.ensure_future(getDomainJson(app, domain))
+            waiters = [asyncio.ensure_future(getDomainJson(app, domain)) for _ in range(3)]
+            await asyncio.sleep(0)
+            waiters[0].cancel()
+            await asyncio.sleep(0)
+            self.releaseFetches()
+            return await asyncio.gather(owner, *waiters, return_exceptions=True)
+
+        results = self.loop.run_until_complete(run())
+        self.assertEqual(self.fetch_count, 1)
+        self.assertTrue(isinstance(results[1], asyncio.CancelledError))
+        # the owner and the other waiters are unaffected
+        for i in (0, 2, 3):
+            self.assertEqual(results[i]["domain"], domain)
+        self.assertTrue(domain in app["domain_cache"])
+
+    def testOwnerCancelled(self):
+        app = self.getApp()
+        domain = "/home/test_user1/a.h5"
+
+        async def run():
+            owner = asyncio.ensure_future(getDomainJson(app, domain))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(getDomainJson(app, domain))
+            await asyncio.sleep(0)
+            owner.cancel()
+            await asyncio.sleep(0)
+            self.releaseFetches()
+            return await asyncio.gather(owner, waiter, return_exceptions=True)
+
+        results = self.loop.run_until_complete(run())
+        self.assertEqual(self.fetch_count, 1)
+        self.assertTrue(isinstance(results[0], asyncio.CancelledError))
+        self.assertEqual(results[1]["domain"], domain)
+        self.assertTrue(domain in app["domain_cache"])
+
+    def testFetchError(self):
+        app = self.getApp()
+        domain = "/home/test_user1/a.h5"
+        self.fetch_error = HTTPNotFound()
+
+        async def run():
+            tasks = [asyncio.ensure_future(getDomainJson(app, domain)) for _ in range(3)]
+            await asyncio.sleep(0)
+            self.releaseFetches()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = self.loop.run_until_complete(run())
+        self.assertEqual(self.fetch_count, 1)
+        for result in results:
+            self.assertTrue(isinstance(result, HTTPNotFound))
+        self.assertFalse(domain in app["domain_cache"])
+        self.assertFalse(domain in app["pending_domain_req"])
+
+        # errors are not cached, the next call fetches again
+        self.fetch_error = None
+        domain_json = self.loop.run_until_complete(getDomainJson(app, domain))
+        self.assertEqual(domain_json["domain"], domain)
+        self.assertEqual(self.fetch_count, 2)
+
+    def testReloadWhilePending(self):
+        app = self.getApp()
+        domain = "/home/test_user1/a.h5"
+
+        async def run():
+            first = asyncio.ensure_future(getDomainJson(app, domain))
+            await asyncio.sleep(0)
+            reload = asyncio.ensure_future(getDomainJson(app, domain, reload=True))
+            await asyncio.sleep(0.01)  # let the fetch tasks start
+            self.assertEqual(self.fetch_count, 2)
+            # the reload fetch finishes before the first one
+            self.fetch_events[1].set()
+            reload_json = await reload
+            self.fetch_events[0].set()
+            first_json = await first
+            return first_json, reload_json
+
+        first_json, reload_json = self.loop.run_until_complete(run())
+        self.assertEqual(first_json["version"], 1)
+        self.assertEqual(reload_json["version"], 2)
+        # the older fetch doesn't replace the reloaded value
+        self.assertEqual(app["domain_cache"][domain]["version"], 2)
+        self.assertFalse(domain in app["pending_domain_req"])
+
+    def testInvalidateWhilePending(self):
+        app = self.getApp()
+        domain = "/home/test_user1/a.h5"
+
+        async def run():
+            first = asyncio.ensure_future(getDomainJson(app, domain))
+            await asyncio.sleep(0)
+            invalidateDomainJson(app, domain)
+            self.assertFalse(domain in app["pending_domain_req"])
+            # a request after the invalidation makes its own fetch
+            second = asyncio.ensure_future(getDomainJson(app, domain))
+            await asyncio.sleep(0.01)  # let the fetch tasks start
+            self.assertEqual(self.fetch_count, 2)
+            self.fetch_events[1].set()
+            second_json = await second
+            self.fetch_events[0].set()
+            first_json = await first
+            return first_json, second_json
+
+        first_json, second_json = self.loop.run_until_complete(run())
+        self.assertEqual(first_json["version"], 1)
+        self.assertEqual(second_json["version"], 2)
+        self.assertEqual(app["domain_cache"][domain]["version"], 2)
+
+        # invalidating removes the cached value
+        invalidateDomainJson(app, domain)
+        self.assertFalse(domain in app["domain_cache"])
+
+
+if __name__ == '__main__':
+    #setup test files
+
+    unittest.main()